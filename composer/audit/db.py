@@ -155,6 +155,20 @@ class AuditDB():
                     SET result = EXCLUDED.result, analysis = EXCLUDED.analysis
                 """, (tool_id, rule_name, thread_id, result, analysis))
     
+    def add_rule_results(self, thread_id: str, results: list[tuple[str, str, str, Optional[str]]]):
+        """
+        Batched form of `add_rule_result`; `results` are (tool_id, rule_name, result, analysis) tuples,
+        all written in one transaction.
+        """
+        with self.conn.transaction():
+            with self.conn.cursor() as cur:
+                cur.executemany("""
+                    INSERT INTO prover_results(tool_id, rule_name, thread_id, result, analysis) VALUES
+                    (%s, %s, %s, %s, %s)
+                    ON CONFLICT (tool_id, rule_name, thread_id) DO UPDATE
+                    SET result = EXCLUDED.result, analysis = EXCLUDED.analysis
+                """, [(tool_id, rule_name, thread_id, result, analysis) for (tool_id, rule_name, result, analysis) in results])
+    
     def add_manual_result(self, thread_id: str, tool_id: str, ref: ManualRef):
         with self.conn.transaction():
             with self.conn.cursor() as cur:
@@ -0,0 +1,30 @@
+from typing import Generic, TypeVar, Hashable
+from collections import OrderedDict
+import threading
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class LRUCache(Generic[K, V]):
+    """
+    A small, thread-safe, bounded mapping for memoizing expensive tool results
+    (typically keyed on a state digest). Least recently used entries are evicted first.
+    """
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
@@ -1,10 +1,12 @@
 from dataclasses import dataclass, field
 import hashlib
+import operator
 
 from graphcore.graph import BoundLLM
 from graphcore.tools.vfs import VFSAccessor
 
 from composer.core.state import AIComposerState
+from composer.core.cache import LRUCache
 from composer.rag.db import PostgreSQLRAGDatabase
 from composer.core.validation import ValidationType, prover
 from composer.input.types import TargetPlatform, get_spec_filename
@@ -24,10 +26,48 @@ class AIComposerContext:
     cvlr_rag_db: PostgreSQLRAGDatabase | None = None
     target: TargetPlatform = "evm"
     spec_filename: str = "rules.spec"
+    # on-disk directory layered under the VFS (resume-from-FS mode), if any
+    fs_layer: str | None = None
+
+def _new_digester() -> hashlib.blake2b:
+    return hashlib.blake2b(digest_size=16)
+
+# Digests of recently seen VFS mappings. LangGraph only replaces the `vfs` channel value (via its
+# reducer) when files are written, so between writes every tool call sees the very same mapping
+# object and its digest can be reused. The mapping and materializer are kept alive alongside the
+# digest so their ids cannot be recycled while the entry is cached. Since each entry pins a whole
+# source tree, and tool calls only ask about the current mapping, just the latest two are kept.
+# This assumes the mapping is the *only* input to the digest: with an on-disk `fs_layer` the
+# materializer also reads files that can change under an unchanged mapping, so the memo is bypassed.
+_DIGEST_MEMO: LRUCache[tuple[int, int], tuple[object, object, str]] = LRUCache(maxsize=2)
 
 def compute_state_digest(c: AIComposerContext, state: AIComposerState) -> str:
+    if c.fs_layer is not None:
+        return _digest_vfs(c, state)
+    vfs = state.get("vfs")
+    memo_key = (id(c.vfs_materializer), id(vfs))
+    memo = _DIGEST_MEMO.get(memo_key)
+    if memo is not None and memo[0] is c.vfs_materializer and memo[1] is vfs:
+        return memo[2]
+    digest = _digest_vfs(c, state)
+    _DIGEST_MEMO.put(memo_key, (c.vfs_materializer, vfs, digest))
+    return digest
+
+def _digest_vfs(c: AIComposerContext, state: AIComposerState) -> str:
     # not interested in cryptographic bulletproofing, just need *some* digest
-    digester = hashlib.md5()
-    for (_, cont) in sorted(c.vfs_materializer.iterate(state), key = lambda x: x[0]):
-        digester.update(cont)
+    # Hash each file as it is produced and only keep (name, leaf digest) around for sorting,
+    # rather than buffering every file's contents in a sorted list.
+    leaves: list[tuple[str, bytes]] = []
+    for (name, cont) in c.vfs_materializer.iterate(state):
+        leaf = _new_digester()
+        leaf.update(cont)
+        leaves.append((name, leaf.digest()))
+    leaves.sort(key=operator.itemgetter(0))
+
+    digester = _new_digester()
+    for (name, leaf_digest) in leaves:
+        # fold in the path so identical contents under different names don't collide
+        digester.update(name.encode("utf-8"))
+        digester.update(b"\0")
+        digester.update(leaf_digest)
     return digester.hexdigest()
@@ -1,26 +1,43 @@
 from typing import NotRequired, Annotated
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from langgraph.graph import MessagesState
 
 from graphcore.tools.vfs import VFSState
 
 class ResultStateSchema(BaseModel):
+    # frozen only guards against field reassignment once the result tool has produced it; it is
+    # neither deep-immutable nor hashable (`source` is a list).
+    # That tool builds it from LLM tool-call arguments, an untrusted boundary, so construction
+    # always validates (no model_construct); nothing downstream rebuilds it.
+    model_config = ConfigDict(frozen=True)
+
     source: list[str] = Field(description="The relative filenames in the virtual FS to present to the user. IMPORTANT: "
               "the filenames here must have been populated by prior put_file tool calls")
     comments: str = Field(description="Any comments or notes on the generated implementation, and a summary of your reasoning, along with any lessons "
               "learned from iterating with the prover.")
 
+# The reducers below never mutate their inputs, so when one side is empty the other can be
+# returned (or copied) without building a merged value.
+
 def merge_validation(left: dict[str, str], right: dict[str, str]) -> dict[str, str]:
-    to_ret = left.copy()
-    to_ret.update(right)
-    return to_ret
+    if not right:
+        return left
+    if not left:
+        return dict(right)
+    return left | right
 
 def merge_skips(left: set[int], right: set[int]) -> set[int]:
-    ret = left.copy()
-    ret.update(right)
-    return ret
+    if not right:
+        return left
+    if not left:
+        return set(right)
+    return left | right
 
+# `vfs` and its reducer come from graphcore's VFSState, `messages` from MessagesState; the
+# reducers defined above only cover the fields owned here. `messages` must keep add_messages
+# rather than a plain list concatenation: graph inputs arrive as str/dict entries that it coerces
+# to messages, and graphcore's summarization replaces history via RemoveMessage/id merges.
 class AIComposerState(VFSState, MessagesState):
     generated_code: NotRequired[ResultStateSchema]
     validation: Annotated[NotRequired[dict[str, str]], merge_validation]
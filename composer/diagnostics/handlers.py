@@ -114,7 +114,7 @@ def print_prover_updates(payload: ProgressUpdate) -> None:
         print(f"Running prover with args: {' '.join(payload['args'])}")
 
 
-audit_guard: set[AuditUpdateTy] = {"manual_search", "rule_result", "summarization"}
+audit_guard: set[AuditUpdateTy] = {"manual_search", "rule_result", "rule_results_batch", "summarization"}
 
 def is_audit_update(x: AllUpdates) -> TypeGuard[AuditUpdate]:
     return x["type"] in audit_guard
@@ -135,6 +135,13 @@ def handle_audit_update(db: AuditDB, upd: AuditUpdate, thread_id: str) -> None:
                 rule_name=upd["rule"],
                 tool_id=upd["tool_id"]
             )
+        case "rule_results_batch":
+            db.add_rule_results(
+                thread_id=thread_id,
+                results=[
+                    (r["tool_id"], r["rule"], r["status"], r["analysis"]) for r in upd["results"]
+                ]
+            )
         case "summarization":
             db.register_summary(
                 thread_id=thread_id,
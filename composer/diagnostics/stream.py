@@ -1,5 +1,6 @@
 from typing import Literal, Generic, TypeVar, TypedDict, List, Dict, Optional, Annotated, Union
 from pydantic import Discriminator
+from langgraph.types import StreamWriter
 from composer.prover.ptypes import StatusCodes
 from composer.rag.types import ManualRef
 
@@ -20,7 +21,7 @@ class ProverResult(UserUpdateData[Literal["prover_result"]]):
 class CEXAnalysis(UserUpdateData[Literal["cex_analysis"]]):
     rule_name: str
 
-AuditUpdateTy = Literal["rule_result", "manual_search", "summarization"]
+AuditUpdateTy = Literal["rule_result", "rule_results_batch", "manual_search", "summarization"]
 
 AuditUpdateTV = TypeVar("AuditUpdateTV", Literal["rule_result"], Literal["manual_search"])
 
@@ -33,6 +34,10 @@ class RuleAuditResult(AuditResult[Literal["rule_result"]]):
     status: StatusCodes
     analysis: Optional[str]
 
+class RuleAuditBatch(TypedDict):
+    type: Literal["rule_results_batch"]
+    results: List[RuleAuditResult]
+
 class SummarizationPartial(TypedDict):
     type: Literal["summarization_raw"]
     summary: str
@@ -50,13 +55,31 @@ ProgressUpdate = Annotated[
 ]
 
 AuditUpdate = Annotated[
-    Union[RuleAuditResult | ManualSearchResult | Summarization], Discriminator("type")
+    Union[RuleAuditResult | RuleAuditBatch | ManualSearchResult | Summarization], Discriminator("type")
 ]
 
 PartialAuditUpdate = Annotated[
-    Union[RuleAuditResult | ManualSearchResult | SummarizationPartial], Discriminator("type")
+    Union[RuleAuditResult | RuleAuditBatch | ManualSearchResult | SummarizationPartial], Discriminator("type")
 ]
 
 AllUpdates = ProgressUpdate | AuditUpdate
 
-PartialUpdates = ProgressUpdate | PartialAuditUpdate
\ No newline at end of file
+PartialUpdates = ProgressUpdate | PartialAuditUpdate
+
+# Below this many rules, results are streamed one event per rule
+RULE_AUDIT_BATCH_THRESHOLD = 16
+
+def write_rule_audits(writer: StreamWriter, audits: List[RuleAuditResult]) -> None:
+    """
+    Stream the per-rule audit results of a prover run. Large rule sets are sent as a single
+    `rule_results_batch` event rather than paying the per-event stream overhead for each rule.
+    """
+    if len(audits) < RULE_AUDIT_BATCH_THRESHOLD:
+        for a in audits:
+            writer(a)
+    else:
+        batch: RuleAuditBatch = {
+            "type": "rule_results_batch",
+            "results": audits
+        }
+        writer(batch)
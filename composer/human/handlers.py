@@ -1,79 +1,109 @@
 from typing import Callable, Optional, cast
 import difflib
+import functools
+import sys
 
 from rich.console import Console
+from rich.text import Text
 
 from composer.human.types import ProposalType, QuestionType, HumanInteractionType, RequirementRelaxationType
 
-def prompt_input(prompt_str: str, debug_thunk: Callable[[], None], filter: Optional[Callable[[str], Optional[str]]] = None) -> str:
+def _read_until_blank(prompt_str: str) -> str:
     l = input(prompt_str + " (double newlines ends): ")
-    buffer = ""
+    lines: list[str] = []
     num_consecutive_blank = 0
     while True:
         x = l.strip()
-        buffer += x + "\n"
+        lines.append(x)
         if x == "":
             num_consecutive_blank += 1
         else:
             num_consecutive_blank = 0
         if num_consecutive_blank == 2:
             break
-        l = input("> ")
-    if buffer.strip() == "DEBUG":
-        debug_thunk()
-        return prompt_input(prompt_str, debug_thunk, filter)
-    if filter is None:
-        return buffer
-    filter_res = filter(buffer)
-    if filter_res is None:
-        return buffer
-    return prompt_input(prompt_str, debug_thunk, filter)
+        # continuation lines skip input()'s prompt/readline machinery; one write + flush per line
+        sys.stdout.write("> ")
+        sys.stdout.flush()
+        l = sys.stdin.readline()
+        if l == "":
+            # EOF: take what we have
+            break
+    return "\n".join(lines) + "\n"
+
+def prompt_input(prompt_str: str, debug_thunk: Callable[[], None], filter: Optional[Callable[[str], Optional[str]]] = None) -> str:
+    while True:
+        buffer = _read_until_blank(prompt_str)
+        if buffer.strip() == "DEBUG":
+            debug_thunk()
+            continue
+        if filter is None:
+            return buffer
+        filter_res = filter(buffer)
+        if filter_res is None:
+            return buffer
+        # tell the user why the response was rejected before asking again
+        print(filter_res)
+
+_PROPOSAL_PREFIXES = ("ACCEPTED", "REJECTED", "REFINE")
+_RELAXATION_PREFIXES = ("ACCEPTED", "REJECTED")
 
 def _print_header(topic: str) -> None:
     print("\n" + "=" * 80)
     print(topic)
     print("=" * 80)
 
-def handle_proposal_interrupt(interrupt_ty: ProposalType, debug_thunk: Callable[[], None]) -> str:
-    _print_header("SPEC CHANGE PROPOSAL")
-    orig = interrupt_ty["current_spec"].splitlines(keepends=True)
-    proposed = interrupt_ty["proposed_spec"].splitlines(keepends=True)
-
-    diff = difflib.unified_diff(
-        a = orig,
+# keyed on the first character; only hunk headers start with "@" in a unified diff
+_DIFF_STYLE = {"-": "red", "+": "green", "@": "cyan"}
+
+def _diff_style(line: str) -> str:
+    if line.startswith(("---", "+++")):
+        return "bold white"
+    return _DIFF_STYLE.get(line[:1], "")
+
+@functools.lru_cache(maxsize=32)
+def _compute_diff(current: str, proposed: str) -> tuple[str, ...]:
+    """
+    The unified diff lines between two versions of the spec. REFINE loops tend to show the
+    same proposal repeatedly, so results are cached on the (hashable) spec contents.
+    """
+    return tuple(difflib.unified_diff(
+        a = current.splitlines(keepends=True),
         fromfile="a/rules.spec",
-        b = proposed,
+        b = proposed.splitlines(keepends=True),
         tofile="b/rules.spec",
         n=3,
-    )
+    ))
+
+def _proposal_filter(x: str) -> Optional[str]:
+    if not x.startswith(_PROPOSAL_PREFIXES):
+        return "Response must begin with ACCEPTED/REJECTED/REFINE"
+    return None
 
+_PROPOSAL_PROMPT = "Response to proposal, must start with ACCEPTED/REJECTED/REFINE"
+
+def handle_proposal_interrupt(interrupt_ty: ProposalType, debug_thunk: Callable[[], None]) -> str:
+    _print_header("SPEC CHANGE PROPOSAL")
     print(f"Explanation: {interrupt_ty['explanation']}")
+    # REFINE loops can come back around with no edits; there is nothing to diff or render
+    if interrupt_ty["current_spec"] == interrupt_ty["proposed_spec"]:
+        print("Proposed spec unchanged.")
+        return prompt_input(_PROPOSAL_PROMPT, debug_thunk, _proposal_filter)
+
+    diff = _compute_diff(interrupt_ty["current_spec"], interrupt_ty["proposed_spec"])
+
     print("Proposed diff is as follows:")
 
     console = Console(highlighter=None)
 
+    # assemble the whole diff and hand it to rich in one print
+    rendered = Text()
     for line in diff:
-        if line.startswith("---"):
-            console.print(line, style="bold white", end="")
-        elif line.startswith("+++"):
-            console.print(line, style="bold white", end="")
-        elif line.startswith("@@"):
-            console.print(line, style="cyan", end="")
-        elif line.startswith("+"):
-            console.print(line, style="green", end="")
-        elif line.startswith("-"):
-            console.print(line, style="red", end="")
-        else:
-            console.print(line, end="")
+        rendered.append(line, style=_diff_style(line))
+    console.print(rendered, end="")
     
     print("")
 
-    def filt(x: str) -> Optional[str]:
-        if not (x.startswith("ACCEPTED") or x.startswith("REJECTED") or x.startswith("REFINE")):
-            return "Response must begin with ACCEPTED/REJECTED/REFINE"
-        return None
-
-    return prompt_input("Response to proposal, must start with ACCEPTED/REJECTED/REFINE", debug_thunk, filt)
+    return prompt_input(_PROPOSAL_PROMPT, debug_thunk, _proposal_filter)
 
 def handle_question_interrupt(interrupt_data: QuestionType, debug_thunk: Callable[[], None]) -> str:
     _print_header("HUMAN ASSISTANCE REQUESTED")
@@ -92,7 +122,7 @@ def handle_req_relaxation_interrupt(interrupt: RequirementRelaxationType, debug_
     print(f"Judgment from oracle:\n{interrupt['judgment']}")
     print(f"Explanation for request:\n{interrupt['explanation']}")
     def filt(r: str) -> str | None:
-        if not r.startswith("ACCEPTED") and not r.startswith("REJECTED"):
+        if not r.startswith(_RELAXATION_PREFIXES):
             return "Response must begin with ACCEPTED/REJECTED"
         return None
     return prompt_input("Response to request, must start with ACCEPTED/REJECTED", debug_thunk, filt)
@@ -109,3 +139,5 @@ def handle_human_interrupt(interrupt_data: dict, debug_thunk: Callable[[], None]
             return handle_question_interrupt(interrupt_ty, debug_thunk)
         case "req_relaxation":
             return handle_req_relaxation_interrupt(interrupt_ty, debug_thunk)
+        case _:
+            raise ValueError(f"Unknown human interaction type: {interrupt_data.get('type')}")
@@ -3,7 +3,6 @@ from concurrent.futures import ThreadPoolExecutor
 from typing_extensions import Iterable
 import asyncio
 from pathlib import Path
-import contextlib
 
 import tempfile
 from dataclasses import dataclass
@@ -18,7 +17,7 @@ from graphcore.utils import cached_invoke
 from graphcore.graph import BoundLLM
 
 from composer.templates.loader import load_jinja_template
-from composer.diagnostics.stream import ProgressUpdate, AuditUpdate
+from composer.diagnostics.stream import ProgressUpdate, RuleAuditResult, write_rule_audits
 from composer.prover.results import read_and_format_run_result
 from composer.prover.ptypes import RuleResult
 from composer.prover.analysis import analyze_cex
@@ -64,14 +63,15 @@ class CertoraRunException(RuntimeError):
 
 def sandboxed_certora_run(
     args: List[str],
-    prover_opts: ProverOptions
+    prover_opts: ProverOptions,
+    cwd: str | None = None
 ) -> SandboxedRunResult:
     wrapper_script = Path(__file__).parent / "certoraRunWrapper.py"
     with tempfile.NamedTemporaryFile("rb") as dump:
         sub_args = [sys.executable, str(wrapper_script)]
         sub_args.append(dump.name)
         sub_args.extend(args)
-        r = subprocess.run(sub_args, encoding="utf-8", capture_output=prover_opts.capture_output)
+        r = subprocess.run(sub_args, encoding="utf-8", capture_output=prover_opts.capture_output, cwd=cwd)
         if r.returncode != 0:
             raise CertoraRunFailure(
                 return_code=r.returncode,
@@ -140,84 +140,86 @@ def certora_prover(
     ctxt = runtime.context
     writer = get_stream_writer()
     with ctxt.vfs_materializer.materialize(state, debug=ctxt.prover_opts.keep_folder) as temp_dir:
-        with contextlib.chdir(temp_dir):
-            try:
-                args = source_files.copy()
+        try:
+            args = source_files.copy()
+            args.extend([
+                "--verify",
+                f"{target_contract}:./rules.spec",
+                "--optimistic_loop",
+                "--optimistic_hashing",
+                "--loop_iter",
+                str(loop_iter),
+                "--solc", compiler_version,
+                "--solc_via_ir",
+                "--strict_solc_optimizer",
+                "--prover_args",
+                "-timeoutCracker true"
+            ])
+            if rule is not None:
                 args.extend([
-                    "--verify",
-                    f"{target_contract}:./rules.spec",
-                    "--optimistic_loop",
-                    "--optimistic_hashing",
-                    "--loop_iter",
-                    str(loop_iter),
-                    "--solc", compiler_version,
-                    "--solc_via_ir",
-                    "--strict_solc_optimizer",
-                    "--prover_args",
-                    "-timeoutCracker true"
+                    "--rule", rule
                 ])
-                if rule is not None:
-                    args.extend([
-                        "--rule", rule
-                    ])
-                run_message: ProgressUpdate = {
-                    "type": "prover_run",
-                    "args": args
-                }
-                writer(run_message)
-
-                try:
-                    res = sandboxed_certora_run(
-                        args, runtime.context.prover_opts
-                    )
-                except CertoraRunFailure as e:
-                    return f"Certora Prover run exited with non-zero returncode {e.return_code}.\nStdout:\n{e.stdout}.\nStderr: {e.stderr}"
-                except CertoraRunException as e:
-                    return f"Certora Prover run failed exceptionally with {str(e.wrapped)}.\nStdout:\n{e.stdout}\nStderr: {e.stderr}"
-                if res is None or res.run_result is None:
-                    return "Certora prover didn't actually run, this is likely a bug you should consult the user about"
-                run_result = res.run_result
-                assert run_result.is_local_link and run_result.link is not None
-
-                formatted_run_result = read_and_format_run_result(Path(run_result.link))
-                if isinstance(formatted_run_result, str):
-                    return formatted_run_result
-                run_message = {
-                    "type": "prover_result",
-                    "status": {k: v.status for (k, v) in formatted_run_result.items()}
-                }
-                writer(run_message)
-
-                runtime = get_runtime(AIComposerContext)
-                failed_count = 0
-                results_param = apply_async_parallel(
-                    lambda d: _analyze(runtime.context.llm, state, d, tool_call_id=tool_call_id),
-                    [ stat for (_, stat) in formatted_run_result.items() ]
+            run_message: ProgressUpdate = {
+                "type": "prover_run",
+                "args": args
+            }
+            writer(run_message)
+
+            try:
+                # run in temp_dir via cwd rather than chdir, which is process-wide and
+                # would race with concurrent prover calls on other threads
+                res = sandboxed_certora_run(
+                    args, runtime.context.prover_opts, cwd=temp_dir
+                )
+            except CertoraRunFailure as e:
+                return f"Certora Prover run exited with non-zero returncode {e.return_code}.\nStdout:\n{e.stdout}.\nStderr: {e.stderr}"
+            except CertoraRunException as e:
+                return f"Certora Prover run failed exceptionally with {str(e.wrapped)}.\nStdout:\n{e.stdout}\nStderr: {e.stderr}"
+            if res is None or res.run_result is None:
+                return "Certora prover didn't actually run, this is likely a bug you should consult the user about"
+            run_result = res.run_result
+            assert run_result.is_local_link and run_result.link is not None
+
+            formatted_run_result = read_and_format_run_result(Path(temp_dir) / run_result.link)
+            if isinstance(formatted_run_result, str):
+                return formatted_run_result
+            run_message = {
+                "type": "prover_result",
+                "status": {k: v.status for (k, v) in formatted_run_result.items()}
+            }
+            writer(run_message)
+
+            runtime = get_runtime(AIComposerContext)
+            failed_count = 0
+            results_param = apply_async_parallel(
+                lambda d: _analyze(runtime.context.llm, state, d, tool_call_id=tool_call_id),
+                [ stat for (_, stat) in formatted_run_result.items() ]
+            )
+            audits: list[RuleAuditResult] = []
+            for (stat, analysis) in results_param:
+                if stat.status == "VIOLATED":
+                    failed_count += 1
+                audits.append({
+                    "analysis": analysis,
+                    "rule": stat.name,
+                    "status": stat.status,
+                    "type": "rule_result",
+                    "tool_id": tool_call_id
+                })
+            write_rule_audits(writer, audits)
+            rule_report = load_jinja_template("rule_feedback.j2", results=results_param)
+            if failed_count > 10:
+                todo_list = report_to_todo_list(state, rule_report, tool_call_id)
+                return SummarizedReport(
+                    report=rule_report,
+                    todo_list=todo_list
                 )
-                for (stat, analysis) in results_param:
-                    if stat.status == "VIOLATED":
-                        failed_count += 1
-                    rule_audit_res: AuditUpdate = {
-                        "analysis": analysis,
-                        "rule": stat.name,
-                        "status": stat.status,
-                        "type": "rule_result",
-                        "tool_id": tool_call_id
-                    }
-                    writer(rule_audit_res)
-                rule_report = load_jinja_template("rule_feedback.j2", results=results_param)
-                if failed_count > 10:
-                    todo_list = report_to_todo_list(state, rule_report, tool_call_id)
-                    return SummarizedReport(
-                        report=rule_report,
-                        todo_list=todo_list
-                    )
-                return RawReport(rule_report, all_verified=(failed_count == 0 and rule is None))
-            except Exception as e:
-                print(str(e))
-                import traceback
-                traceback.print_exc()
-                sys.exit(1)
+            return RawReport(rule_report, all_verified=(failed_count == 0 and rule is None))
+        except Exception as e:
+            print(str(e))
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
 
 def report_to_todo_list(state: AIComposerState, report: str, tool_call_id: str) -> str:
     runtime = get_runtime(AIComposerContext)
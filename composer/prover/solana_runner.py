@@ -1,20 +1,26 @@
-from typing import Optional, List
+from typing import Optional, List, Callable, IO, Sequence
 from pathlib import Path
-import contextlib
+import functools
 import subprocess
+import threading
+import codecs
+import queue
 import shutil
+import os
 import json
 import re
 from dataclasses import dataclass
 
 from langgraph.config import get_stream_writer
+from langgraph.types import StreamWriter
 from langgraph.runtime import get_runtime
 
 from composer.templates.loader import load_jinja_template
-from composer.diagnostics.stream import ProgressUpdate, AuditUpdate
+from composer.diagnostics.stream import ProgressUpdate, RuleAuditResult, write_rule_audits
 from composer.prover.ptypes import RuleResult, RulePath, StatusCodes
 from composer.core.state import AIComposerState
-from composer.core.context import AIComposerContext, ProverOptions
+from composer.core.context import AIComposerContext, ProverOptions, compute_state_digest
+from composer.core.cache import LRUCache
 
 
 @dataclass
@@ -51,44 +57,174 @@ SOLANA_PROVER_NOT_FOUND_MSG = (
 )
 
 
-def parse_prover_output(stdout: str, stderr: str, rule: str) -> dict[str, StatusCodes]:
+# Rule-independent fallbacks
+_VERIFIED_RE = re.compile(r'VERIFIED', re.IGNORECASE)
+_VIOLATED_RE = re.compile(r'VIOLATED|FAILED', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_rule_patterns(rule: str) -> tuple[re.Pattern[str], re.Pattern[str], re.Pattern[str], re.Pattern[str]]:
     """
-    Parse certoraSolanaProver output to extract rule results.
-    
-    The prover outputs results in various formats. This function attempts to
-    extract the verification status for each rule.
+    Build the (verified, violated, timeout, mentioned) patterns for `rule`.
+
+    Rule names recur across prover runs, so these are cached rather than recompiled per call.
     """
-    results: dict[str, StatusCodes] = {}
-    combined = stdout + stderr
-    
-    # Look for common result patterns
+    escaped = re.escape(rule)
     # Pattern: "rule_name: VERIFIED" or "rule_name: VIOLATED"
-    verified_pattern = re.compile(rf'\b({re.escape(rule)})\s*[:\-]\s*(VERIFIED|PASSED)', re.IGNORECASE)
-    violated_pattern = re.compile(rf'\b({re.escape(rule)})\s*[:\-]\s*(VIOLATED|FAILED)', re.IGNORECASE)
-    timeout_pattern = re.compile(rf'\b({re.escape(rule)})\s*[:\-]\s*(TIMEOUT)', re.IGNORECASE)
-    
-    if verified_pattern.search(combined):
-        results[rule] = "VERIFIED"
-    elif violated_pattern.search(combined):
-        results[rule] = "VIOLATED"
-    elif timeout_pattern.search(combined):
-        results[rule] = "TIMEOUT"
-    elif "VERIFIED" in combined.upper() and rule.lower() in combined.lower():
-        results[rule] = "VERIFIED"
-    elif "VIOLATED" in combined.upper() or "FAILED" in combined.upper():
-        results[rule] = "VIOLATED"
-    else:
-        # Default: if exit code was 0, assume verified
-        results[rule] = "VERIFIED"
-    
-    return results
+    return (
+        re.compile(rf'\b({escaped})\s*[:\-]\s*(VERIFIED|PASSED)', re.IGNORECASE),
+        re.compile(rf'\b({escaped})\s*[:\-]\s*(VIOLATED|FAILED)', re.IGNORECASE),
+        re.compile(rf'\b({escaped})\s*[:\-]\s*(TIMEOUT)', re.IGNORECASE),
+        re.compile(escaped, re.IGNORECASE),
+    )
+
+
+def _resolve_status(
+    verified: bool,
+    violated: bool,
+    timeout: bool,
+    mentions_verified: bool,
+    mentions_violated: bool
+) -> StatusCodes:
+    if verified:
+        return "VERIFIED"
+    elif violated:
+        return "VIOLATED"
+    elif timeout:
+        return "TIMEOUT"
+    elif mentions_verified:
+        return "VERIFIED"
+    elif mentions_violated:
+        return "VIOLATED"
+    # Default: if exit code was 0, assume verified
+    return "VERIFIED"
+
+
+class ProverOutputScanner:
+    """
+    Extracts the verification status of `rule` from the certoraSolanaProver output.
+
+    The scanner is fed the output one line at a time as it is produced, so the result is
+    available as soon as the process exits, without searching the whole (potentially very
+    large) output afterwards.
+    """
+    def __init__(self, rule: str):
+        self.rule = rule
+        (self._verified, self._violated, self._timeout, self._mentioned) = _compile_rule_patterns(rule)
+        self.found_verified = False
+        self.found_violated = False
+        self.found_timeout = False
+        self.saw_rule = False
+        self.saw_verified = False
+        self.saw_violated = False
+
+    def feed(self, line: str) -> None:
+        if self.found_verified:
+            # nothing later in the output can change the verdict
+            return
+        if self._mentioned.search(line):
+            self.saw_rule = True
+            self.found_verified = self._verified.search(line) is not None
+            self.found_violated = self.found_violated or self._violated.search(line) is not None
+            self.found_timeout = self.found_timeout or self._timeout.search(line) is not None
+        self.saw_verified = self.saw_verified or _VERIFIED_RE.search(line) is not None
+        self.saw_violated = self.saw_violated or _VIOLATED_RE.search(line) is not None
+
+    def results(self) -> dict[str, StatusCodes]:
+        return {self.rule: _resolve_status(
+            verified=self.found_verified,
+            violated=self.found_violated,
+            timeout=self.found_timeout,
+            mentions_verified=self.saw_verified and self.saw_rule,
+            mentions_violated=self.saw_violated
+        )}
+
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class _LineDecoder:
+    """Incrementally decodes a byte stream and splits it into complete lines."""
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial = ""
+
+    def feed(self, chunk: bytes, final: bool = False) -> list[str]:
+        text = self._partial + self._decoder.decode(chunk, final)
+        lines = text.splitlines(keepends=True)
+        self._partial = ""
+        # a trailing "\r" may be the first half of a "\r\n" split across reads
+        if lines and not final and (text.endswith("\r") or not lines[-1].endswith(("\n", "\r"))):
+            self._partial = lines.pop()
+        return [l.rstrip("\r\n") for l in lines]
+
+
+def _pump(pipe: IO[bytes], tag: int, chunks: "queue.SimpleQueue[tuple[int, bytes | None]]") -> None:
+    fd = pipe.fileno()
+    try:
+        while chunk := os.read(fd, _READ_CHUNK_SIZE):
+            chunks.put((tag, chunk))
+    finally:
+        chunks.put((tag, None))
+
+
+def _run_streaming(
+    args: List[str],
+    cwd: Path,
+    on_line: Callable[[str], None]
+) -> tuple[int, str, str]:
+    """
+    Run `args`, handing each line of stdout/stderr to `on_line` as it arrives.
+
+    One reader thread per pipe pulls 64 KiB chunks; the lines are dispatched on the
+    calling thread. Returns the exit code along with the full decoded stdout/stderr.
+    """
+    chunks: "queue.SimpleQueue[tuple[int, bytes | None]]" = queue.SimpleQueue()
+    raw = (bytearray(), bytearray())
+    decoders = (_LineDecoder(), _LineDecoder())
+    with subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=-1) as proc:
+        assert proc.stdout is not None and proc.stderr is not None
+        readers = [
+            threading.Thread(target=_pump, args=(pipe, tag, chunks), daemon=True)
+            for (tag, pipe) in enumerate((proc.stdout, proc.stderr))
+        ]
+        for r in readers:
+            r.start()
+        open_pipes = len(readers)
+        while open_pipes:
+            (tag, chunk) = chunks.get()
+            if chunk is None:
+                open_pipes -= 1
+                lines = decoders[tag].feed(b"", final=True)
+            else:
+                raw[tag].extend(chunk)
+                lines = decoders[tag].feed(chunk)
+            for line in lines:
+                on_line(line)
+        for r in readers:
+            r.join()
+        returncode = proc.wait()
+    return (
+        returncode,
+        raw[0].decode("utf-8", errors="replace"),
+        raw[1].decode("utf-8", errors="replace")
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _locate_solana_prover() -> str | None:
+    """
+    Resolve certoraSolanaProver on PATH once, instead of re-scanning PATH on every run.
+    Cleared whenever the prover turns out not to be installed.
+    """
+    return shutil.which("certoraSolanaProver")
 
 
 def run_solana_prover(
     project_dir: Path,
     rule: str,
     prover_opts: ProverOptions,
-    prover_args: List[str] | None = None
+    prover_args: Sequence[str] | None = None
 ) -> SolanaRunResult:
     """
     Run certoraSolanaProver from the project directory.
@@ -97,56 +233,52 @@ def run_solana_prover(
     1. Call cargo certora-sbf to build the project
     2. Read metadata from Cargo.toml [package.metadata.certora]
     3. Submit the verification job
+
+    When capturing output, it is read incrementally and parsed as it arrives.
     """
-    cli = "certoraSolanaProver"
-    
     # Preflight check: ensure the binary exists on PATH
-    if shutil.which(cli) is None:
+    cli = _locate_solana_prover()
+    if cli is None:
+        _locate_solana_prover.cache_clear()
         raise SolanaProverNotInstalled(SOLANA_PROVER_NOT_FOUND_MSG)
     
-    # Build command: certoraSolanaProver --rule <rule_name> [prover_args]
-    args = [cli, "--rule", rule]
-    
-    # Add optional prover args
-    if prover_args:
-        args.extend(["--prover_args"] + prover_args)
-    
-    # Add rule sanity check
-    args.extend(["--rule_sanity", "basic"])
+    # Build command: certoraSolanaProver --rule <rule_name> [--prover_args ...] --rule_sanity basic
+    args = [
+        cli, "--rule", rule,
+        *(("--prover_args", *prover_args) if prover_args else ()),
+        "--rule_sanity", "basic"
+    ]
     
+    scanner = ProverOutputScanner(rule)
+
     try:
-        result = subprocess.run(
-            args,
-            cwd=project_dir,
-            capture_output=prover_opts.capture_output,
-            encoding="utf-8"
-        )
+        if prover_opts.capture_output:
+            (returncode, stdout, stderr) = _run_streaming(args, cwd=project_dir, on_line=scanner.feed)
+        else:
+            returncode = subprocess.run(args, cwd=project_dir).returncode
+            (stdout, stderr) = ("", "")
     except FileNotFoundError:
+        # the cached location went stale (binary moved/uninstalled); probe again next time
+        _locate_solana_prover.cache_clear()
         raise SolanaProverNotInstalled(SOLANA_PROVER_NOT_FOUND_MSG)
     
-    stdout = result.stdout if result.stdout else ""
-    stderr = result.stderr if result.stderr else ""
-    
-    if result.returncode != 0:
+    if returncode != 0:
         raise SolanaProverFailure(
-            return_code=result.returncode,
+            return_code=returncode,
             stderr=stderr,
             stdout=stdout
         )
     
-    # Parse results from output
-    results = parse_prover_output(stdout, stderr, rule)
-    
     return SolanaRunResult(
-        exit_code=result.returncode,
+        exit_code=returncode,
         stderr=stderr,
         stdout=stdout,
-        results=results
+        results=scanner.results()
     )
 
 
-# Default prover args for Solana verification
-DEFAULT_SOLANA_PROVER_ARGS = [
+# Default prover args for Solana verification; each entry is passed as-is as one argv element
+DEFAULT_SOLANA_PROVER_ARGS: tuple[str, ...] = (
     "-solanaOptimisticJoin true",
     "-solanaOptimisticOverlaps true",
     "-solanaOptimisticMemcpyPromotion true",
@@ -155,27 +287,26 @@ DEFAULT_SOLANA_PROVER_ARGS = [
     "-unsatCoresForAllAsserts true",
     "-solanaAggressiveGlobalDetection true",
     "-solanaTACOptimize 0",
-]
+)
 
 
-def solana_prover(
+# (state digest, rule, prover args) -> per-rule status of a previous run
+_PROVER_RESULT_CACHE: LRUCache[tuple[str, str, tuple[str, ...]], dict[str, StatusCodes]] = LRUCache(maxsize=256)
+
+# Timeouts and errors may not recur on a rerun, so only definitive answers are cached
+_CACHEABLE_STATUSES: frozenset[StatusCodes] = frozenset(("VERIFIED", "VIOLATED"))
+
+
+def _run_on_state(
     rule: str,
     state: AIComposerState,
-    tool_call_id: str
-) -> SolanaRawReport | str:
+    ctxt: AIComposerContext,
+    writer: StreamWriter
+) -> dict[str, StatusCodes] | str:
     """
-    Run the Certora Solana Prover on the current VFS state.
-    
-    The Solana prover:
-    1. Runs from the project directory (where Cargo.toml is located)
-    2. Uses cargo certora-sbf internally to build the SBF target
-    3. Reads [package.metadata.certora] from Cargo.toml for sources/summaries
-    4. Requires --rule flag to specify which rule to verify
+    Materialize `state` and run the prover on `rule`, returning the per-rule status,
+    or an error message for the LLM.
     """
-    runtime = get_runtime(AIComposerContext)
-    ctxt = runtime.context
-    writer = get_stream_writer()
-    
     with ctxt.vfs_materializer.materialize(state, debug=ctxt.prover_opts.keep_folder) as temp_dir:
         project_dir = Path(temp_dir)
         
@@ -192,13 +323,13 @@ def solana_prover(
         writer(run_message)
         
         try:
-            with contextlib.chdir(project_dir):
-                result = run_solana_prover(
-                    project_dir=project_dir,
-                    rule=rule,
-                    prover_opts=ctxt.prover_opts,
-                    prover_args=DEFAULT_SOLANA_PROVER_ARGS
-                )
+            # run_solana_prover passes cwd to the subprocess; no process-wide chdir needed
+            result = run_solana_prover(
+                project_dir=project_dir,
+                rule=rule,
+                prover_opts=ctxt.prover_opts,
+                prover_args=DEFAULT_SOLANA_PROVER_ARGS
+            )
         except SolanaProverNotInstalled as e:
             return f"Error: {e}"
         except SolanaProverFailure as e:
@@ -206,37 +337,71 @@ def solana_prover(
         
         if result.results is None:
             return "Certora Solana Prover didn't produce results, this is likely a bug you should consult the user about"
+        return result.results
+
+
+def solana_prover(
+    rule: str,
+    state: AIComposerState,
+    tool_call_id: str
+) -> SolanaRawReport | str:
+    """
+    Run the Certora Solana Prover on the current VFS state.
+    
+    The Solana prover:
+    1. Runs from the project directory (where Cargo.toml is located)
+    2. Uses cargo certora-sbf internally to build the SBF target
+    3. Reads [package.metadata.certora] from Cargo.toml for sources/summaries
+    4. Requires --rule flag to specify which rule to verify
+    """
+    runtime = get_runtime(AIComposerContext)
+    ctxt = runtime.context
+    writer = get_stream_writer()
+
+    # A byte-identical VFS checked against the same rule and arguments gives the same answer;
+    # look this up before materializing anything.
+    cache_key = (compute_state_digest(c=ctxt, state=state), rule, DEFAULT_SOLANA_PROVER_ARGS)
+    rule_statuses = _PROVER_RESULT_CACHE.get(cache_key)
+    if rule_statuses is None:
+        run_res = _run_on_state(rule, state, ctxt, writer)
+        if isinstance(run_res, str):
+            return run_res
+        rule_statuses = run_res
+        if all(status in _CACHEABLE_STATUSES for status in rule_statuses.values()):
+            _PROVER_RESULT_CACHE.put(cache_key, rule_statuses)
+    
+    # Format results
+    all_verified = True
+    results_list: list[tuple[RuleResult, str | None]] = []
+    audits: list[RuleAuditResult] = []
+    
+    for rule_name, status in rule_statuses.items():
+        rule_path = RulePath(rule=rule_name)
+        rule_result = RuleResult(
+            path=rule_path,
+            cex_dump=None,
+            status=status
+        )
+        results_list.append((rule_result, None))
         
-        # Format results
-        all_verified = True
-        results_list: list[tuple[RuleResult, str | None]] = []
-        
-        for rule_name, status in result.results.items():
-            rule_path = RulePath(rule=rule_name)
-            rule_result = RuleResult(
-                path=rule_path,
-                cex_dump=None,
-                status=status
-            )
-            results_list.append((rule_result, None))
-            
-            if status != "VERIFIED":
-                all_verified = False
-            
-            rule_audit_res: AuditUpdate = {
-                "analysis": None,
-                "rule": rule_name,
-                "status": status,
-                "type": "rule_result",
-                "tool_id": tool_call_id
-            }
-            writer(rule_audit_res)
-        
-        run_message_result = {
-            "type": "prover_result",
-            "status": {k: v for (k, v) in result.results.items()}
-        }
-        writer(run_message_result)
+        if status != "VERIFIED":
+            all_verified = False
         
-        rule_report = load_jinja_template("rule_feedback.j2", results=results_list)
-        return SolanaRawReport(rule_report, all_verified=all_verified)
+        audits.append({
+            "analysis": None,
+            "rule": rule_name,
+            "status": status,
+            "type": "rule_result",
+            "tool_id": tool_call_id
+        })
+    write_rule_audits(writer, audits)
+    
+    run_message_result: ProgressUpdate = {
+        "type": "prover_result",
+        # copy: rule_statuses may be the dict held in the result cache
+        "status": dict(rule_statuses)
+    }
+    writer(run_message_result)
+    
+    rule_report = load_jinja_template("rule_feedback.j2", results=results_list)
+    return SolanaRawReport(rule_report, all_verified=all_verified)
@@ -1,11 +1,18 @@
 from typing import Any
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
+import functools
 import pathlib
 
 script_dir = pathlib.Path(__file__).parent
-env = Environment(loader=FileSystemLoader(script_dir))
+# templates ship with the package and don't change while running; skip the per-lookup mtime check
+env = Environment(loader=FileSystemLoader(script_dir), auto_reload=False)
+
+@functools.lru_cache(maxsize=None)
+def get_jinja_template(template_name: str) -> Template:
+    """Load and compile a Jinja template from the script directory, once per process"""
+    return env.get_template(template_name)
 
 def load_jinja_template(template_name: str, **kwargs: Any) -> str:
     """Load and render a Jinja template from the script directory"""
-    template = env.get_template(template_name)
+    template = get_jinja_template(template_name)
     return template.render(**kwargs)
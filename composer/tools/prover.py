@@ -1,10 +1,10 @@
 from typing import Annotated, Optional
-import hashlib
+import asyncio
 from pydantic import Field
 
 from graphcore.graph import WithToolCallId, tool_return
 
-from langchain_core.tools import tool, InjectedToolCallId
+from langchain_core.tools import StructuredTool, InjectedToolCallId
 from langchain_core.messages import ToolMessage, HumanMessage
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
@@ -13,7 +13,6 @@ from langgraph.runtime import get_runtime
 from composer.core.state import AIComposerState
 from composer.core.context import AIComposerContext, compute_state_digest
 from composer.core.validation import prover as prover_key
-from composer.prover.runner import certora_prover as prover_impl, RawReport, SummarizedReport
 
 class CertoraProverArgs(WithToolCallId):
     """
@@ -79,8 +78,7 @@ class CertoraProverArgs(WithToolCallId):
     state: Annotated[AIComposerState, InjectedState]
 
 
-@tool(args_schema=CertoraProverArgs)
-def certora_prover(
+def _certora_prover(
     source_files: list[str],
     # spec_file: str,
     target_contract: str,
@@ -90,6 +88,9 @@ def certora_prover(
     state: Annotated[AIComposerState, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId]
 ) -> Command:
+    # deferred: the runner pulls in certoraRun and the analysis stack
+    from composer.prover.runner import certora_prover as prover_impl, RawReport, SummarizedReport
+
     result = prover_impl(
         source_files,
         target_contract,
@@ -137,4 +138,35 @@ def certora_prover(
                     ]
                 }
             )
-    
\ No newline at end of file
+    
+
+
+async def _certora_prover_async(
+    source_files: list[str],
+    target_contract: str,
+    compiler_version: str,
+    loop_iter: int,
+    rule: Optional[str],
+    state: Annotated[AIComposerState, InjectedState],
+    tool_call_id: Annotated[str, InjectedToolCallId]
+) -> Command:
+    # a prover run takes minutes; keep it off the event loop so sibling tool calls proceed.
+    # to_thread copies the context, so get_runtime/get_stream_writer still resolve in the worker
+    return await asyncio.to_thread(
+        _certora_prover,
+        source_files,
+        target_contract,
+        compiler_version,
+        loop_iter,
+        rule,
+        state,
+        tool_call_id
+    )
+
+
+certora_prover = StructuredTool.from_function(
+    func=_certora_prover,
+    coroutine=_certora_prover_async,
+    name="certora_prover",
+    args_schema=CertoraProverArgs
+)
@@ -38,7 +38,9 @@ def check_tdd_gate(state: AIComposerState, ctxt: AIComposerContext) -> str | Non
             "Once tests pass, you can run the prover."
         )
     
-    # Tests have passed at some point - check if state has changed since
+    # Tests have passed at some point - check if state has changed since.
+    # compute_state_digest is memoized on the identity of the VFS mapping, so when no file
+    # has been written since the last digest this is a lookup rather than a rehash.
     current_digest = compute_state_digest(c=ctxt, state=state)
     tests_digest = validation[tests_key]
     
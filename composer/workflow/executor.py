@@ -17,7 +17,7 @@ from graphcore.tools.memory import memory_tool
 
 from composer.input.types import WorkflowOptions, InputData, ResumeFSData, ResumeIdData, ResumeInput, NativeFS, get_spec_filename
 from composer.workflow.factories import get_checkpointer, get_cryptostate_builder, get_store, get_memory, get_vfs_tools, get_memory_ns
-from composer.workflow.types import Input, PromptParams
+from composer.workflow.types import Input, PromptParams, intern_vfs_paths
 from composer.workflow.meta import create_resume_commentary
 from composer.core.state import ResultStateSchema, AIComposerState
 from composer.core.context import AIComposerContext, ProverOptions
@@ -84,7 +84,7 @@ def get_fresh_input(input: InputData, workflow_options: WorkflowOptions) -> Inpu
                     "type": "text",
                     "text": get_reference_input(input_data=input, debug_prompt=workflow_options.debug_prompt_override)
                 }
-            ], vfs=vfs_contents)
+            ], vfs=intern_vfs_paths(vfs_contents))
 
 @dataclass
 class InputChangeDesc:
@@ -145,7 +145,7 @@ def get_resume_id_input(input: ResumeIdData, resume_art: ResumeArtifact, workflo
     
     return Input(
         input=input_messages,
-        vfs=new_vfs
+        vfs=intern_vfs_paths(new_vfs)
     )
 
 def get_resume_fs_input(input: ResumeFSData, resume_art: ResumeArtifact, workflow_options: WorkflowOptions) -> tuple[Input, InputFileLike, InputFileLike]:
@@ -380,7 +380,7 @@ def execute_ai_composer_workflow(
         from composer.core.validation import tests as tests_type
         required_validations.append(tests_type)
     
-    work_context = AIComposerContext(llm=bound_llm, rag_db=rag_db, prover_opts=prover_opts, vfs_materializer=materializer, required_validations=required_validations, cvlr_rag_db=cvlr_rag_db, target=workflow_options.target, spec_filename=spec_filename)
+    work_context = AIComposerContext(llm=bound_llm, rag_db=rag_db, prover_opts=prover_opts, vfs_materializer=materializer, required_validations=required_validations, cvlr_rag_db=cvlr_rag_db, target=workflow_options.target, spec_filename=spec_filename, fs_layer=fs_layer)
 
     curr_state_config: RunnableConfig = {
         "configurable": {
@@ -1,10 +1,11 @@
 from typing import TypedDict
+import sys
 
 from graphcore.graph import FlowInput
 from composer.input.types import TargetPlatform
 
 # Re-export for convenience
-__all__ = ["TargetPlatform", "PromptParams", "Input"]
+__all__ = ["TargetPlatform", "PromptParams", "Input", "intern_vfs_paths"]
 
 class PromptParams(TypedDict):
     is_resume: bool
@@ -15,3 +16,10 @@ class Input(FlowInput):
     Input state, with initial virtual fs definitions
     """
     vfs: dict[str, str]
+
+def intern_vfs_paths(files: dict[str, str]) -> dict[str, str]:
+    """
+    Copy of `files` with interned path keys. The same handful of paths recur in every VFS
+    update and reducer merge, so interning lets lookups succeed on pointer comparison.
+    """
+    return {sys.intern(k): v for (k, v) in files.items()}